@@ -1,33 +1,147 @@
 import streamlit as st
 import ollama
-import json
+import httpx
 import pandas as pd
-import re
 import logging
 from datetime import datetime
 import time
+import itertools
+import io
+import hashlib
+import asyncio
+import threading
 import rag_engine  # Import our new RAG module
+from audit_utils import (
+    MAX_INPUT_LENGTH,
+    sanitize_input,
+    split_findings,
+    build_user_message,
+    apply_verified_mappings,
+    parse_risks,
+    risks_to_frame,
+)
 
 # --- CONFIGURATION ---
 MODEL_NAME = "llama3.2"
-MAX_INPUT_LENGTH = 10000  # Prevent abuse
 OLLAMA_MAX_RETRIES = 3  # Number of retry attempts
+OLLAMA_TIMEOUT = 120.0  # 2 minute HTTP timeout per request
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model loaded between chats
+
+# Generation options shared by every chat, including the warm-up.
+# A different num_ctx per request would make Ollama reload the model.
+GENERATION_OPTIONS = {
+    'num_ctx': 4096,  # Finding + 3 policy chunks (~2k tokens) + system prompt
+    'num_predict': 1024,  # Cap output tokens - no runaway generations
+    'temperature': 0.0,  # Deterministic output for a fixed JSON task
+    'top_p': 1.0,
+    'repeat_penalty': 1.0,
+}
+STREAM_RENDER_EVERY = 8  # Re-render the live preview every N chunks
+STREAM_PREVIEW_CHARS = 2000  # Tail of the output shown while streaming
+
+# Static system prompt: identical on every request so Ollama can reuse its
+# prefill (KV cache). Per-finding data goes in the user message instead.
+STATIC_SYSTEM = """You are a GRC compliance analyst.
+Map the user's audit findings to the following frameworks:
+1. ISO 27001:2022
+2. SOC 2 Type II
+3. HIPAA Security Rule
+4. NIST CSF 2.0
+
+The user message contains an AUDIT FINDING and may also contain:
+- VERIFIED CONTROLS from our database. Use these control IDs exactly as given in "mappings".
+- RELEVANT COMPANY POLICY. YOU MUST PRIORITIZE IT over general standards and reference it in your recommendation.
+
+YOUR TASK:
+1. Write a clear, professional risk description (2-3 sentences)
+2. Write an actionable remediation recommendation (specific steps)
+
+Output STRICT JSON only. No markdown. No explanation.
+Structure:
+{
+    "risks": [
+        {
+            "description": "Clear description of the security risk",
+            "recommendation": "Specific remediation steps",
+            "mappings": {
+                "iso_27001": "Control ID (e.g. A.9.4.1)",
+                "soc_2": "Criteria ID (e.g. CC6.1)",
+                "hipaa": "Rule ID (e.g. 164.312(a)(1))",
+                "nist_csf": "Function ID (e.g. PR.AC-7)"
+            }
+        }
+    ]
+}"""
 
 # --- CACHED INITIALIZATION ---
 @st.cache_resource
 def initialize_rag_engine():
     """
-    Initialize and cache the RAG engine (ChromaDB collections).
-    This runs once and is cached across all sessions for better performance.
+    Initialize and cache the RAG engine (ChromaDB client, embedding model
+    and collections).
+    This runs once per process and is shared across all sessions, so the
+    embedding model is only loaded once.
     """
+    engine = rag_engine.get_engine()
     rag_engine.load_crosswalk_db()
-    return {
-        'crosswalk': rag_engine.crosswalk_collection,
-        'policy': rag_engine.policy_collection
-    }
+    return engine
 
 # Load RAG engine (cached)
-rag_collections = initialize_rag_engine()
+rag = initialize_rag_engine()
+
+@st.cache_resource
+def get_ollama_client():
+    """
+    Shared Ollama client, created once per process.
+    Reusing it keeps the HTTP connection alive across requests and reruns.
+    """
+    return ollama.Client(timeout=OLLAMA_TIMEOUT)
+
+_CLIENT = get_ollama_client()
+
+@st.cache_resource(show_spinner="🔥 Loading model...")
+def warm_up_model():
+    """
+    Send a one-token request so the model is loaded (and the static system
+    prompt prefilled) at startup rather than on the first analysis.
+    Runs once per process; keep_alive keeps the model resident afterwards.
+    Errors propagate: cache_resource does not cache them, so a failed
+    warm-up is retried on the next rerun.
+    """
+    _CLIENT.chat(
+        model=MODEL_NAME,
+        messages=[
+            {'role': 'system', 'content': STATIC_SYSTEM},
+            {'role': 'user', 'content': 'ready?'},
+        ],
+        options={**GENERATION_OPTIONS, 'num_predict': 1},
+        keep_alive=OLLAMA_KEEP_ALIVE
+    )
+    logging.info("Model warm-up complete")
+    return True
+
+@st.cache_resource
+def policy_index_state():
+    """
+    Process-wide record of the policy file currently in the index.
+    The policy collection is shared by all sessions, so this is too.
+    """
+    return {'digest': None, 'lock': threading.Lock()}
+
+def text_digest(text):
+    """SHA-1 of a text, used as the cache key for retrieval results."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def cached_retrieval(text_hashes, _texts):
+    """
+    Crosswalk mappings and policy context for a batch of findings, fetched
+    concurrently and cached by the findings' hashes (`_texts` is not hashed
+    by Streamlit), so resubmitting notes skips embedding + vector search.
+    Cleared whenever a new policy is ingested. Failures raise, so they are
+    never cached.
+    """
+    return rag_engine.retrieve_batch(_texts)
 
 # --- LOGGING SETUP ---
 logging.basicConfig(
@@ -43,51 +157,21 @@ st.set_page_config(
 )
 
 # --- HELPER FUNCTIONS ---
-def extract_json(text):
-    """
-    Robust JSON extraction that handles nested objects.
-    Finds the largest {...} block in the text.
-    """
-    try:
-        # Try simple parsing first
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Improved regex that handles nested braces
-        # Matches outer {...} including nested structures
-        json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}'
-        match = re.search(json_pattern, text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(0))
-            except json.JSONDecodeError:
-                pass
-    return None
-
-def sanitize_input(text):
-    """
-    Basic input sanitization to prevent injection attacks.
-    Removes potentially dangerous characters while preserving audit text.
-    """
-    if not text or len(text) > MAX_INPUT_LENGTH:
-        return None
-
-    # Remove null bytes and control characters (except newlines/tabs)
-    sanitized = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', text)
-
-    return sanitized.strip()
-
+@st.cache_data(ttl=30, show_spinner=False)
 def check_ollama_status():
     """
     Checks if Ollama service is running AND if the specific model is available.
+    Cached for 30 seconds so widget reruns don't each make an HTTP call.
     """
     try:
-        models = ollama.list()
+        models = _CLIENT.list()
         # Check if our model exists in the list
         model_names = [model['model'] for model in models.get('models', [])]
 
         # Handle both exact match and tag variations
+        prefix = MODEL_NAME.split(':')[0]
         model_available = any(
-            MODEL_NAME in name or name.startswith(MODEL_NAME.split(':')[0])
+            MODEL_NAME in name or name.startswith(prefix)
             for name in model_names
         )
 
@@ -96,26 +180,41 @@ def check_ollama_status():
         logging.error(f"Ollama status check failed: {e}")
         return False
 
-def ollama_chat_with_retry(model, messages, options=None, max_retries=OLLAMA_MAX_RETRIES):
+def ollama_chat_with_retry(model, messages, options=None, format=None, max_retries=OLLAMA_MAX_RETRIES):
     """
-    Call Ollama chat with exponential backoff retry logic.
+    Open a streaming Ollama chat with exponential backoff retry logic.
+
+    Only stream initialization is retried. The client connects lazily, so the
+    first chunk is pulled inside the retry loop; failures after that point
+    propagate to the caller instead of silently restarting the generation.
 
     Args:
         model (str): Model name
         messages (list): Chat messages
-        options (dict): Ollama options (timeout, etc.)
+        options (dict): Ollama options (num_ctx, etc.)
+        format (str): Output format constraint, e.g. 'json'
         max_retries (int): Maximum retry attempts
 
     Returns:
-        dict: Ollama response
+        iterator: Ollama response chunks
 
     Raises:
         Exception: If all retries fail
     """
     for attempt in range(max_retries):
         try:
-            response = ollama.chat(model=model, messages=messages, options=options)
-            return response
+            stream = _CLIENT.chat(
+                model=model,
+                messages=messages,
+                options=options,
+                format=format,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                stream=True
+            )
+            first_chunk = next(stream, None)
+            if first_chunk is None:
+                return iter(())
+            return itertools.chain([first_chunk], stream)
         except Exception as e:
             if attempt == max_retries - 1:
                 # Last attempt failed, re-raise
@@ -127,6 +226,98 @@ def ollama_chat_with_retry(model, messages, options=None, max_retries=OLLAMA_MAX
             logging.warning(f"Ollama call failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {e}")
             time.sleep(wait_time)
 
+def collect_stream(chunks, placeholder, render_every=STREAM_RENDER_EVERY):
+    """
+    Accumulate streamed tokens into the full response text.
+
+    Renders a live preview into a Streamlit placeholder every `render_every`
+    chunks (throttled to avoid rerender storms) and clears it once the
+    stream closes.
+
+    Returns:
+        str: The complete model output
+    """
+    buf = ""
+    for i, chunk in enumerate(chunks, 1):
+        buf += chunk['message']['content']
+        if i % render_every == 0:
+            placeholder.markdown(buf[-STREAM_PREVIEW_CHARS:])
+    placeholder.empty()
+    return buf
+
+async def _async_chat_with_retry(client, messages, options=None, format=None, max_retries=OLLAMA_MAX_RETRIES):
+    """
+    Async counterpart of ollama_chat_with_retry for a single, non-streamed chat.
+    """
+    for attempt in range(max_retries):
+        try:
+            return await client.chat(
+                model=MODEL_NAME,
+                messages=messages,
+                options=options,
+                format=format,
+                keep_alive=OLLAMA_KEEP_ALIVE
+            )
+        except Exception as e:
+            if attempt == max_retries - 1:
+                logging.error(f"Ollama call failed after {max_retries} attempts: {e}")
+                raise
+
+            wait_time = 2 ** attempt
+            logging.warning(f"Ollama call failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {e}")
+            await asyncio.sleep(wait_time)
+
+async def analyze_findings_concurrently(user_messages, options=None):
+    """
+    Send one chat request per finding and await them together.
+
+    Ollama serves concurrent requests in parallel up to OLLAMA_NUM_PARALLEL,
+    and each request only carries its own finding instead of one long context.
+
+    Returns:
+        list: Raw model outputs, in the same order as `user_messages`
+    """
+    # Async clients are bound to the event loop, so one is created per run
+    client = ollama.AsyncClient(timeout=OLLAMA_TIMEOUT)
+    tasks = [
+        _async_chat_with_retry(
+            client,
+            messages=[
+                {'role': 'system', 'content': STATIC_SYSTEM},
+                {'role': 'user', 'content': user_message},
+            ],
+            options=options,
+            format='json',
+        )
+        for user_message in user_messages
+    ]
+    responses = await asyncio.gather(*tasks)
+    return [response['message']['content'] for response in responses]
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def build_csv_report(risks):
+    """
+    Serialize the risk list to UTF-8 CSV bytes.
+    Writes straight into a bytes buffer (no intermediate str copy) and is
+    cached on the risk list so reruns don't rebuild the report.
+    """
+    df = pd.DataFrame(risks)
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8', chunksize=1000)
+    return buf.getvalue()
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def build_parquet_report(risks):
+    """
+    Serialize the risk list to zstd-compressed Parquet bytes.
+    Columnar and much smaller than CSV for long risk lists; mappings are
+    flattened into one string column per framework.
+    """
+    df = risks_to_frame(risks)
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False, compression='zstd')
+    return buf.getvalue()
+
 # --- SIDEBAR ---
 with st.sidebar:
     st.image("https://img.icons8.com/fluency/96/security-checked.png", width=60)
@@ -134,6 +325,10 @@ with st.sidebar:
 
     # SERVICE HEALTH CHECK
     if check_ollama_status():
+        try:
+            warm_up_model()
+        except Exception as e:
+            logging.warning(f"Model warm-up failed: {e}")
         st.success(f"🟢 System Online ({MODEL_NAME})")
     else:
         st.error("🔴 Ollama Offline or Model Missing")
@@ -143,29 +338,42 @@ with st.sidebar:
     st.markdown("---")
     st.caption("🔒 Privacy Mode: Active (No Cloud)")
     st.caption(f"📊 Max Input: {MAX_INPUT_LENGTH} chars")
+    st.caption("⚡ Multiple findings run in parallel - start Ollama with `OLLAMA_NUM_PARALLEL=4`")
 
     # --- RAG: POLICY UPLOAD ---
     st.markdown("---")
     st.subheader("📚 Knowledge Base")
     uploaded_file = st.file_uploader("Upload Policy (PDF)", type="pdf")
+
+    if rag_engine.policies_need_reupload():
+        st.warning("⚠️ The policy index was reset after an embedding model change. Please re-upload your policy.")
     
-    if uploaded_file:
-        # Save temp file
-        temp_path = f"temp_{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
-        with st.spinner("🧠 Ingesting Policy..."):
-            success, msg = rag_engine.ingest_policy(temp_path)
-            if success:
-                st.success("Policy Learned!")
-            else:
-                st.error(f"Error: {msg}")
-        
-        # Cleanup
-        import os
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    # Ingest only when the indexed policy changes - not on every rerun, and
+    # not when another session already ingested the same file
+    policy_state = policy_index_state()
+    policy_digest = hashlib.sha1(uploaded_file.getbuffer()).hexdigest() if uploaded_file else None
+    if uploaded_file and policy_state['digest'] != policy_digest:
+        with policy_state['lock']:
+            if policy_state['digest'] != policy_digest:
+                # Save temp file
+                temp_path = f"temp_{uploaded_file.name}"
+                with open(temp_path, "wb") as f:
+                    f.write(uploaded_file.getbuffer())
+
+                with st.spinner("🧠 Ingesting Policy..."):
+                    success, msg = rag_engine.ingest_policy(temp_path, source=uploaded_file.name)
+                    # Policy context cached for the old document is now stale
+                    cached_retrieval.clear()
+                    if success:
+                        policy_state['digest'] = policy_digest
+                        st.success("Policy Learned!")
+                    else:
+                        st.error(f"Error: {msg}")
+
+                # Cleanup
+                import os
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
 
 # --- MAIN UI ---
 st.title("🛡️ Automated Risk & Compliance Mapper")
@@ -205,118 +413,81 @@ if analyze_btn and audit_input:
                 # Log the audit request (without full content for privacy)
                 logging.info(f"Audit analysis started - Input length: {len(clean_input)} chars")
 
-                # --- STEP 1: GET DATABASE MAPPINGS (ELIMINATES HALLUCINATIONS) ---
-                db_mappings = rag_engine.get_framework_mappings(clean_input)
-                
-                # --- STEP 2: RETRIEVE POLICY CONTEXT ---
-                context = rag_engine.query_policy(clean_input)
-                context_text = f"\n\nRELEVANT COMPANY POLICY:\n{context}" if context else ""
+                # Each bullet/paragraph is analyzed as its own finding
+                findings = split_findings(clean_input)
+                logging.info(f"Split input into {len(findings)} finding(s)")
+
+                finding_hashes = tuple(text_digest(f) for f in findings)
+
+                # --- STEP 1 + 2: GET DATABASE MAPPINGS (ELIMINATES HALLUCINATIONS)
+                # AND RETRIEVE POLICY CONTEXT, concurrently ---
+                try:
+                    all_mappings, all_contexts = cached_retrieval(finding_hashes, findings)
+                except Exception as e:
+                    # Not cached - the next analysis retries the lookup
+                    logging.error(f"Retrieval failed: {e}")
+                    st.warning("⚠️ Database lookup failed. Continuing without verified mappings or policy context.")
+                    all_mappings = all_contexts = [None] * len(findings)
 
                 # --- STEP 3: BUILD PROMPT BASED ON DATABASE RESULTS ---
-                if db_mappings:
-                    # Database found a match - use verified control IDs
-                    st.info(f"✅ Matched to risk pattern: {db_mappings.get('pattern_name', 'Unknown')}")
-                    
-                    system_prompt = f"""
-                    You are a GRC compliance analyst.
-                    
-                    The finding has been mapped to these verified controls from our database:
-                    - ISO 27001: {db_mappings.get('iso_27001', 'N/A')}
-                    - SOC 2: {db_mappings.get('soc_2', 'N/A')}
-                    - HIPAA: {db_mappings.get('hipaa', 'N/A')}
-                    - NIST CSF: {db_mappings.get('nist_csf', 'N/A')}
-                    
-                    {context_text}
-                    
-                    YOUR TASK:
-                    1. Write a clear, professional risk description (2-3 sentences)
-                    2. Write an actionable remediation recommendation (specific steps)
-                    3. If company policy is provided above, reference it in your recommendation
-                    
-                    Output STRICT JSON only. No markdown. No explanation.
-                    Structure: 
-                    {{
-                        "risks": [
-                            {{
-                                "description": "Clear description of the security risk",
-                                "recommendation": "Specific remediation steps",
-                                "mappings": {{
-                                    "iso_27001": "{db_mappings.get('iso_27001', 'N/A')}",
-                                    "soc_2": "{db_mappings.get('soc_2', 'N/A')}",
-                                    "hipaa": "{db_mappings.get('hipaa', 'N/A')}",
-                                    "nist_csf": "{db_mappings.get('nist_csf', 'N/A')}"
-                                }}
-                            }}
-                        ]
-                    }}
-                    """
-                else:
-                    # No database match - fallback to LLM (but warn user)
-                    st.warning("⚠️ No exact database match found. Using AI analysis (may be less accurate).")
-                    
-                    system_prompt = f"""
-                    You are an expert GRC Automation Engine.
-                    Map the user's audit findings to the following frameworks:
-                    1. ISO 27001:2022
-                    2. SOC 2 Type II
-                    3. HIPAA Security Rule
-                    4. NIST CSF 2.0
-                    
-                    {context_text}
-                    
-                    If the company policy is provided above, YOU MUST PRIORITIZE IT over general standards.
-                    Output STRICT JSON only. No markdown. No chatter.
-                    Structure: 
-                    {{
-                        "risks": [
-                            {{
-                                "description": "...", 
-                                "recommendation": "...",
-                                "mappings": {{
-                                    "iso_27001": "Control ID (e.g. A.9.4.1)",
-                                    "soc_2": "Criteria ID (e.g. CC6.1)",
-                                    "hipaa": "Rule ID (e.g. 164.312(a)(1))",
-                                    "nist_csf": "Function ID (e.g. PR.AC-7)"
-                                }}
-                            }}
-                        ]
-                    }}
-                    """
+                user_messages = []
+                for finding, db_mappings, context in zip(findings, all_mappings, all_contexts):
+                    if db_mappings:
+                        st.info(f"✅ Matched to risk pattern: {db_mappings.get('pattern_name', 'Unknown')}")
+                    else:
+                        # No database match - fallback to LLM (but warn user)
+                        st.warning("⚠️ No exact database match found. Using AI analysis (may be less accurate).")
+                    user_messages.append(build_user_message(finding, db_mappings, context))
 
                 # --- STEP 4: CALL LLM (with retry logic) ---
-                response = ollama_chat_with_retry(
-                    model=MODEL_NAME,
-                    messages=[
-                        {'role': 'system', 'content': system_prompt},
-                        {'role': 'user', 'content': clean_input},
-                    ],
-                    options={'timeout': 120.0}  # 2 minute timeout
-                )
-
-                raw_output = response['message']['content']
+                if len(findings) == 1:
+                    # Single finding: stream tokens as they are generated
+                    chunks = ollama_chat_with_retry(
+                        model=MODEL_NAME,
+                        messages=[
+                            {'role': 'system', 'content': STATIC_SYSTEM},
+                            {'role': 'user', 'content': user_messages[0]},
+                        ],
+                        options=GENERATION_OPTIONS,
+                        format='json'  # Constrain decoding to valid JSON
+                    )
+                    raw_outputs = [collect_stream(chunks, st.empty())]
+                else:
+                    # Several findings: fan out concurrent requests
+                    raw_outputs = asyncio.run(analyze_findings_concurrently(
+                        user_messages,
+                        options=GENERATION_OPTIONS
+                    ))
 
                 # --- STEP 5: EXTRACT AND VALIDATE JSON ---
-                data = extract_json(raw_output)
-
-                if data:
-                    # Normalize list/dict
-                    risks = data.get("risks", data) if isinstance(data, dict) else data
-
-                    # Validate risk structure
-                    if isinstance(risks, list) and all(isinstance(r, dict) for r in risks):
-                        # Save to session state (Persistence)
-                        st.session_state.results = risks
-                        logging.info(f"Analysis successful - {len(risks)} risks identified")
+                all_risks = []
+                failed = 0
+                for idx, (raw_output, db_mappings) in enumerate(zip(raw_outputs, all_mappings), 1):
+                    risks, error = parse_risks(raw_output)
+                    if error:
+                        failed += 1
+                        if error == "invalid_structure":
+                            st.error(f"❌ Invalid risk data structure (finding #{idx}).")
+                        else:
+                            st.error(f"❌ AI Output Error: Could not parse JSON (finding #{idx}).")
+                        with st.expander(f"Debug Raw Output (finding #{idx})"):
+                            st.code(raw_output)
                     else:
-                        st.error("❌ Invalid risk data structure")
-                        logging.error("Risk validation failed - not a list of dicts")
+                        # Control IDs come from the database, not the model
+                        all_risks.extend(apply_verified_mappings(risks, db_mappings))
+
+                if all_risks:
+                    # Save to session state (Persistence)
+                    st.session_state.results = all_risks
+                    logging.info(f"Analysis successful - {len(all_risks)} risks identified")
                 else:
-                    st.error("❌ AI Output Error: Could not parse JSON.")
-                    logging.error("JSON parsing failed")
-                    with st.expander("Debug Raw Output"):
-                        st.code(raw_output)
+                    # Don't leave the previous analysis on screen as if it were this one
+                    st.session_state.results = None
+                    if not failed:
+                        st.info("ℹ️ No risks identified in this input.")
+                        logging.info("Analysis complete - no risks identified")
 
-            except TimeoutError:
+            except (TimeoutError, httpx.TimeoutException):
                 st.error("⏱️ Request timed out. The model may be overloaded. Please try again.")
                 logging.error("Ollama API request timed out")
             except Exception as e:
@@ -351,8 +522,7 @@ if st.session_state.results:
                 st.success(f"**Recommendation:** {rec}")
 
         # EXPORT TO CSV
-        df = pd.DataFrame(st.session_state.results)
-        csv = df.to_csv(index=False).encode('utf-8')
+        csv = build_csv_report(st.session_state.results)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -363,4 +533,19 @@ if st.session_state.results:
             mime='text/csv',
         )
 
+        # EXPORT TO PARQUET (optional - CSV stays available if this fails)
+        try:
+            parquet = build_parquet_report(st.session_state.results)
+        except Exception as e:
+            parquet = None
+            logging.warning(f"Parquet export unavailable: {e}")
+
+        if parquet:
+            st.download_button(
+                label="📥 Download Audit Report (Parquet)",
+                data=parquet,
+                file_name=f'audit_report_{timestamp}.parquet',
+                mime='application/vnd.apache.parquet',
+            )
+
         logging.info(f"Report exported - {len(st.session_state.results)} risks")
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Text processing for audit findings and model output: input sanitization,
+splitting notes into findings, prompt building and JSON extraction.
+
+Kept free of Streamlit and database imports so it can be imported (and
+tested) without starting the app.
+"""
+import json
+import logging
+import re
+
+import pandas as pd
+
+try:
+    # Rust-based parser, several times faster; raises a json.JSONDecodeError subclass
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+MAX_INPUT_LENGTH = 10000  # Prevent abuse
+MAX_FINDINGS = 10  # Above this, notes are analyzed as a single finding
+
+# Control characters stripped by sanitize_input (keeps \t, \n, \r)
+_CTRL_TABLE = dict.fromkeys(list(range(0, 9)) + [11, 12] + list(range(14, 32)) + [127])
+
+def find_json_span(s, start=None):
+    """
+    Locate the first balanced {...} or [...] block in a string.
+
+    Single linear pass tracking bracket depth; brackets inside string literals
+    (including escaped quotes) are ignored, so there is no regex backtracking.
+
+    Args:
+        s: Text to scan
+        start: Index of the opening bracket (defaults to the first '{' or '[')
+
+    Returns:
+        tuple: (start, end) slice indices, or None if no balanced block exists
+    """
+    if start is None:
+        starts = [i for i in (s.find('{'), s.find('[')) if i != -1]
+        start = min(starts) if starts else -1
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(s)):
+        ch = s[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+    return None
+
+def extract_json(text):
+    """
+    Robust JSON extraction that handles nested objects and arrays.
+    Falls back to the first balanced {...} or [...] block in the text. A
+    leading [...] is only taken if it is a list of objects (not e.g. a
+    "[1]" reference); otherwise the first {...} block after it is used.
+    """
+    try:
+        # Try simple parsing first
+        return json_loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    span = find_json_span(text)
+    if span and text[span[0]] == '[':
+        try:
+            data = json_loads(text[span[0]:span[1]])
+            if data and all(isinstance(item, dict) for item in data):
+                return data
+        except json.JSONDecodeError:
+            pass
+        span = find_json_span(text, text.find('{', span[0]))
+    if span:
+        try:
+            return json_loads(text[span[0]:span[1]])
+        except json.JSONDecodeError:
+            pass
+    return None
+
+def sanitize_input(text):
+    """
+    Basic input sanitization to prevent injection attacks.
+    Removes potentially dangerous characters while preserving audit text.
+    """
+    # Cheap rejects first, before any copy of the text is made
+    # (translate and strip only ever remove characters)
+    if not text or len(text) > MAX_INPUT_LENGTH or text.isspace():
+        return None
+
+    # Remove null bytes and control characters (except newlines/tabs)
+    cleaned = text.translate(_CTRL_TABLE).strip()
+
+    # Input made only of control characters and whitespace
+    return cleaned or None
+
+_BULLET_RE = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s+')
+
+def split_findings(text):
+    """
+    Split audit notes into individual findings.
+
+    Bulleted/numbered lines and blank-line separated paragraphs each become
+    one finding. Prose without either stays a single finding, as does input
+    that fragments into more than MAX_FINDINGS pieces. Headings (a line
+    ending in ':' outside a bullet, e.g. "Findings:") are skipped; no other
+    text is dropped.
+
+    Returns:
+        list: Finding strings (never empty for non-empty input)
+    """
+    findings = []
+    current = []
+    in_bullet = False
+
+    def flush():
+        if current:
+            finding = " ".join(current)
+            if in_bullet or not finding.endswith(':'):
+                findings.append(finding)
+            current.clear()
+
+    for line in text.splitlines():
+        if not line.strip():
+            flush()
+            in_bullet = False
+        elif _BULLET_RE.match(line):
+            flush()
+            in_bullet = True
+            current.append(_BULLET_RE.sub('', line, count=1).strip())
+        else:
+            current.append(line.strip())
+    flush()
+
+    if not findings or len(findings) > MAX_FINDINGS:
+        return [text]
+    return findings
+
+def build_user_message(finding, db_mappings, context):
+    """
+    Build the dynamic user message for one finding: verified database
+    mappings and retrieved policy context (when available), then the finding.
+    """
+    parts = []
+
+    if db_mappings:
+        # Database found a match - use verified control IDs
+        parts.append(
+            "VERIFIED CONTROLS:\n"
+            f"- iso_27001: {db_mappings.get('iso_27001', 'N/A')}\n"
+            f"- soc_2: {db_mappings.get('soc_2', 'N/A')}\n"
+            f"- hipaa: {db_mappings.get('hipaa', 'N/A')}\n"
+            f"- nist_csf: {db_mappings.get('nist_csf', 'N/A')}"
+        )
+
+    if context:
+        parts.append(f"RELEVANT COMPANY POLICY:\n{context}")
+
+    parts.append(f"AUDIT FINDING:\n{finding}")
+    return "\n\n".join(parts)
+
+FRAMEWORK_KEYS = ('iso_27001', 'soc_2', 'hipaa', 'nist_csf')
+
+def apply_verified_mappings(risks, db_mappings):
+    """
+    Overwrite the model's control IDs with the database mappings.
+
+    The model is told to copy the VERIFIED CONTROLS, but nothing forces it
+    to; when the finding matched a crosswalk pattern, the database values
+    are authoritative.
+
+    Returns:
+        list: The same risk dicts, updated in place
+    """
+    if db_mappings:
+        for risk in risks:
+            risk['mappings'] = {key: db_mappings.get(key, 'N/A') for key in FRAMEWORK_KEYS}
+    return risks
+
+def parse_risks(raw_output):
+    """
+    Extract and validate the risk list from a model response.
+
+    Responses are requested with format='json', so the direct parse in
+    extract_json normally succeeds; the brace scan is only a fallback.
+
+    Returns:
+        tuple: (risks, error). risks is a list of risk dicts (possibly
+        empty) or None; error is None on success, "invalid_json" if no JSON
+        could be parsed, or "invalid_structure" if the JSON is not a list
+        of risk dicts
+    """
+    data = extract_json(raw_output)
+    if data is None:
+        logging.error("JSON parsing failed")
+        return None, "invalid_json"
+
+    # Normalize list/dict
+    risks = data.get("risks", data) if isinstance(data, dict) else data
+
+    # Validate risk structure
+    if isinstance(risks, list) and all(isinstance(r, dict) for r in risks):
+        return risks, None
+
+    logging.error("Risk validation failed - not a list of dicts")
+    return None, "invalid_structure"
+
+def _cell_text(value):
+    """Render one report cell as text (lists joined, missing values empty)."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value)
+
+def risks_to_frame(risks):
+    """
+    Flatten the risk list into a table of string columns.
+
+    mappings becomes one column per framework (mappings.iso_27001, ...).
+    Model output is not type-checked, so a control may be a string in one
+    risk and a list in another; everything is rendered as text so columnar
+    writers such as Parquet get one type per column.
+    """
+    df = pd.json_normalize(risks)
+    for col in df.columns:
+        df[col] = df[col].map(_cell_text)
+    return df
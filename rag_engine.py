@@ -1,79 +1,397 @@
 import chromadb
+import numpy as np
 import pandas as pd
 from chromadb.utils import embedding_functions
 import logging
 import os
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # --- LOGGING SETUP ---
 # Ensure logging is configured if this module is run standalone
 logging.basicConfig(level=logging.INFO)
 
-# Initialize ChromaDB client
-# We use a persistent client so data is saved to disk
-chroma_client = chromadb.PersistentClient(path="./chroma_db")
+# Policy chunking / ingestion settings
+CHUNK_TARGET_WORDS = 500  # ~512 embedding tokens per chunk
+CHUNK_OVERLAP_WORDS = 50  # Words repeated between consecutive chunks
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", 64))  # Chunks per add() call
 
-# Embedding function (same for both collections)
-# This uses the default all-MiniLM-L6-v2 model which is small and runs locally
-default_ef = embedding_functions.DefaultEmbeddingFunction()
+CHROMA_PATH = "./chroma_db"  # Persistent client so data is saved to disk
+CROSSWALK_CSV = "framework_crosswalk.csv"
+CROSSWALK_CACHE_DIR = "crosswalk_cache"  # Pattern embeddings saved next to the CSV
+EMBED_PROVIDERS = ['CPUExecutionProvider']  # ONNX Runtime execution providers
+QUERY_EMBED_CACHE_SIZE = 1024  # Query embeddings kept in memory (LRU)
+MAPPING_CACHE_SIZE = 512  # Crosswalk lookup results kept in memory (LRU)
 
-# Two separate collections
-# 1. For Company Policies (PDFs)
-policy_collection = chroma_client.get_or_create_collection(
-    name="company_policies",
-    embedding_function=default_ef
-)
+# ChromaDB client, embedding function and both collections.
+# Created lazily by get_engine() so importing this module stays cheap.
+Engine = namedtuple('Engine', ['client', 'ef', 'policy', 'crosswalk'])
+_STATE = None
+_STATE_LOCK = threading.Lock()  # Concurrent first calls must not open two clients
 
-# 2. For Framework Cross-Walk (CSV)
-crosswalk_collection = chroma_client.get_or_create_collection(
-    name="framework_crosswalk",
-    embedding_function=default_ef
-)
+# Embedding model, shared by the engine and every embedding call
+_EMBED_MODEL = None
+_EMBED_MODEL_LOCK = threading.Lock()
 
-def load_crosswalk_db():
+def _get_embed_model():
+    """
+    Return the process-wide embedding function, loading the model on first use.
+
+    Not DefaultEmbeddingFunction: ChromaDB builds a fresh ONNX session for it
+    on every embed call.
+    """
+    global _EMBED_MODEL
+    if _EMBED_MODEL is None:
+        with _EMBED_MODEL_LOCK:
+            if _EMBED_MODEL is None:
+                _EMBED_MODEL = embedding_functions.ONNXMiniLM_L6_V2(preferred_providers=EMBED_PROVIDERS)
+    return _EMBED_MODEL
+
+def get_engine():
+    """
+    Return the process-wide RAG engine, creating it on first use.
+
+    The embedding function is the ONNX build of all-MiniLM-L6-v2, which is
+    small and runs locally. A single instance (one ONNX Runtime session) is
+    shared by both collections:
+    1. company_policies - Company Policies (PDFs)
+    2. framework_crosswalk - Framework Cross-Walk (CSV)
+
+    Returns:
+        Engine: (client, ef, policy, crosswalk)
+    """
+    global _STATE
+    if _STATE is None:
+        with _STATE_LOCK:
+            if _STATE is None:
+                client = chromadb.PersistentClient(path=CHROMA_PATH)
+                ef = _get_embed_model()
+                policy = _get_or_create_collection(client, "company_policies", ef)
+                crosswalk = _get_or_create_collection(client, "framework_crosswalk", ef)
+                _STATE = Engine(client, ef, policy, crosswalk)
+    return _STATE
+
+# Collections dropped by _get_or_create_collection in this process
+_RESET_COLLECTIONS = set()
+
+def policies_need_reupload():
+    """
+    True if the stored policies were dropped (see _get_or_create_collection)
+    and no policy has been ingested since; the UI should ask for a re-upload.
+    """
+    return "company_policies" in _RESET_COLLECTIONS
+
+def _get_or_create_collection(client, name, ef):
+    """
+    get_or_create_collection that migrates collections persisted with a
+    different embedding function config (e.g. "default").
+
+    The stale collection is dropped and recreated empty: the crosswalk is
+    reloaded from CSV by load_crosswalk_db, policies must be re-uploaded
+    (reported through policies_need_reupload).
+
+    The distance space is pinned to L2 (the ONNX function would default to
+    cosine), which is what the get_framework_mappings threshold assumes.
+    """
+    try:
+        return client.get_or_create_collection(
+            name=name,
+            embedding_function=ef,
+            metadata={"hnsw:space": "l2"}
+        )
+    except ValueError as e:
+        if "conflict" not in str(e).lower():
+            raise
+        logging.warning(f"⚠️ Recreating collection '{name}' for new embedding function: {e}")
+        client.delete_collection(name)
+        _RESET_COLLECTIONS.add(name)
+        return client.get_or_create_collection(
+            name=name,
+            embedding_function=ef,
+            metadata={"hnsw:space": "l2"}
+        )
+
+_ENGINE_ATTRS = {
+    'chroma_client': 'client',
+    'default_ef': 'ef',
+    'policy_collection': 'policy',
+    'crosswalk_collection': 'crosswalk',
+}
+
+def __getattr__(name):
+    """Keep rag_engine.crosswalk_collection etc. working, backed by get_engine()."""
+    if name in _ENGINE_ATTRS:
+        return getattr(get_engine(), _ENGINE_ATTRS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _LRUCache:
+    """
+    Bounded, thread-safe mapping that evicts the least recently used key.
+
+    Lookups and inserts take whole batches so callers can resolve all cache
+    misses with a single embedding pass or query.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Return a dict with the cached entries among `keys`."""
+        with self._lock:
+            hits = {k: self._data[k] for k in keys if k in self._data}
+            for k in hits:
+                self._data.move_to_end(k)
+        return hits
+
+    def put_many(self, items):
+        with self._lock:
+            self._data.update(items)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+# Query text -> embedding
+_QUERY_EMBED_CACHE = _LRUCache(QUERY_EMBED_CACHE_SIZE)
+# (finding text, threshold) -> crosswalk metadata or None; cleared whenever
+# the crosswalk collection changes
+_MAPPING_CACHE = _LRUCache(MAPPING_CACHE_SIZE)
+
+def _embed_queries(texts):
+    """
+    Embed query texts, reusing embeddings of texts seen before.
+
+    The same findings are queried against both collections and re-analyzed
+    within a session, so most lookups are cache hits. Misses are embedded
+    together in a single forward pass.
+
+    Returns:
+        List with one embedding per text
+    """
+    cached = _QUERY_EMBED_CACHE.get_many(texts)
+
+    misses = list(dict.fromkeys(t for t in texts if t not in cached))
+    if misses:
+        embedded = dict(zip(misses, _get_embed_model()(misses)))
+        cached.update(embedded)
+        _QUERY_EMBED_CACHE.put_many(embedded)
+
+    return [cached[t] for t in texts]
+
+def load_crosswalk_db(rebuild=False):
     """
     Load the framework crosswalk CSV into the vector database.
     This should be called once at app startup.
+
+    The collection is persisted in CHROMA_PATH, so once built (see
+    scripts/build_crosswalk.py) later startups skip the embedding step.
+
+    Embeddings are also saved to CROSSWALK_CACHE_DIR and reused when the
+    collection has to be refilled from an unchanged CSV.
+
+    Args:
+        rebuild: Drop the stored crosswalk and re-embed it from the CSV,
+                 ignoring the saved embeddings
     """
     try:
+        global _STATE
+        engine = get_engine()
+        if rebuild:
+            engine.client.delete_collection("framework_crosswalk")
+            _STATE = engine._replace(
+                crosswalk=_get_or_create_collection(engine.client, "framework_crosswalk", engine.ef)
+            )
+            _MAPPING_CACHE.clear()
+
+        crosswalk_collection = get_engine().crosswalk
+
         # Check if already loaded to avoid duplicates
         if crosswalk_collection.count() > 0:
             logging.info(f"✅ Crosswalk DB already loaded ({crosswalk_collection.count()} patterns)")
             return True
         
         # Load from CSV
-        if not os.path.exists('framework_crosswalk.csv'):
-            logging.warning("⚠️ framework_crosswalk.csv not found. Crosswalk features disabled.")
+        if not os.path.exists(CROSSWALK_CSV):
+            logging.warning(f"⚠️ {CROSSWALK_CSV} not found. Crosswalk features disabled.")
             return False
 
-        df = pd.read_csv('framework_crosswalk.csv')
-        
         # Add each risk pattern to the database
-        ids = [str(i) for i in range(len(df))]
-        documents = df['description'].tolist()
-        metadatas = []
-        
-        for _, row in df.iterrows():
-            metadatas.append({
-                'pattern_name': row['risk_pattern'],
-                'iso_27001': row['iso_27001'],
-                'soc_2': row['soc_2'],
-                'hipaa': row['hipaa'],
-                'nist_csf': row['nist_csf']
-            })
+        ids, documents, metadatas = _read_crosswalk_csv()
+
+        # Reuse the embeddings saved by a previous load if the CSV is unchanged
+        stamp = _crosswalk_stamp(ids, _get_embed_model())
+        embeddings = None if rebuild else _load_crosswalk_embeddings(ids, stamp)
+        if embeddings is None:
+            embeddings = _get_embed_model()(documents)
+            _save_crosswalk_embeddings(ids, embeddings, stamp)
+        else:
+            logging.info(f"✅ Using cached crosswalk embeddings from {CROSSWALK_CACHE_DIR}")
 
         crosswalk_collection.add(
             ids=ids,
             documents=documents,  # Searchable text
-            metadatas=metadatas
+            metadatas=metadatas,
+            embeddings=embeddings
         )
+        _MAPPING_CACHE.clear()
         
-        logging.info(f"✅ Loaded {len(df)} risk patterns into crosswalk database")
+        logging.info(f"✅ Loaded {len(ids)} risk patterns into crosswalk database")
         return True
         
     except Exception as e:
         logging.error(f"❌ Error loading crosswalk DB: {e}")
         return False
 
+def _crosswalk_stamp(ids, ef):
+    """
+    Validity stamp for the embedding sidecar: CSV hash, pattern count and
+    embedding model. Any change to one of them forces a re-embed.
+    """
+    with open(CROSSWALK_CSV, 'rb') as f:
+        csv_hash = hashlib.sha256(f.read()).hexdigest()
+    return f"{csv_hash}\n{len(ids)}\n{ef.name()}\n"
+
+def _load_crosswalk_embeddings(ids, stamp):
+    """
+    Load pattern embeddings saved by _save_crosswalk_embeddings.
+
+    The matrix is stored as float16 and widened back to the float32 that
+    ChromaDB expects.
+
+    Returns:
+        Embedding matrix aligned with `ids`, or None if the sidecar is
+        missing or stale
+    """
+    try:
+        with open(os.path.join(CROSSWALK_CACHE_DIR, "stamp.txt")) as f:
+            if f.read() != stamp:
+                return None
+        if np.load(os.path.join(CROSSWALK_CACHE_DIR, "ids.npy")).tolist() != ids:
+            return None
+        return np.load(os.path.join(CROSSWALK_CACHE_DIR, "matrix.npy")).astype(np.float32)
+    except (OSError, ValueError):
+        return None
+
+def _save_crosswalk_embeddings(ids, embeddings, stamp):
+    """
+    Save pattern embeddings as .npy files so the next load skips the model.
+
+    float16 halves the file; rounding moves match distances by well under
+    1e-3, which only matters for a finding sitting right at the threshold.
+    """
+    stamp_path = os.path.join(CROSSWALK_CACHE_DIR, "stamp.txt")
+    try:
+        os.makedirs(CROSSWALK_CACHE_DIR, exist_ok=True)
+        # Invalidate first; the stamp is only written once both arrays are
+        if os.path.exists(stamp_path):
+            os.remove(stamp_path)
+        np.save(os.path.join(CROSSWALK_CACHE_DIR, "matrix.npy"), np.asarray(embeddings, dtype=np.float16))
+        np.save(os.path.join(CROSSWALK_CACHE_DIR, "ids.npy"), np.array(ids))
+        with open(stamp_path, "w") as f:
+            f.write(stamp)
+    except OSError as e:
+        logging.warning(f"⚠️ Could not save crosswalk embeddings: {e}")
+
+def _read_crosswalk_csv():
+    """
+    Read the crosswalk CSV into (ids, documents, metadatas).
+
+    A pattern's ID is the SHA-256 of its CSV row (also stored as the
+    'row_hash' metadata field): unchanged rows keep their ID across reloads
+    and edited rows get a new one. Duplicate rows are dropped.
+    """
+    df = pd.read_csv(CROSSWALK_CSV)
+
+    ids = []
+    documents = []
+    metadatas = []
+    seen = set()
+
+    # Read column-wise (iterrows boxes every row into a Series)
+    for pattern_name, iso_27001, soc_2, hipaa, nist_csf, description in zip(
+        df['risk_pattern'].tolist(),
+        df['iso_27001'].tolist(),
+        df['soc_2'].tolist(),
+        df['hipaa'].tolist(),
+        df['nist_csf'].tolist(),
+        df['description'].tolist()
+    ):
+        row_text = "\x1f".join(str(v) for v in (pattern_name, iso_27001, soc_2, hipaa, nist_csf, description))
+        row_hash = hashlib.sha256(row_text.encode('utf-8')).hexdigest()
+        if row_hash in seen:
+            continue
+        seen.add(row_hash)
+
+        ids.append(row_hash)
+        documents.append(description)
+        metadatas.append({
+            'pattern_name': pattern_name,
+            'iso_27001': iso_27001,
+            'soc_2': soc_2,
+            'hipaa': hipaa,
+            'nist_csf': nist_csf,
+            'row_hash': row_hash
+        })
+
+    return ids, documents, metadatas
+
+def sync_crosswalk_db():
+    """
+    Bring the crosswalk collection in line with the CSV.
+    Only new or edited rows are embedded; rows that were edited or removed
+    are deleted. Unchanged rows are left alone. The embedding sidecar is
+    rewritten from the stored embeddings if the CSV changed.
+
+    Returns:
+        Tuple (added, removed) with pattern counts, or None on error
+    """
+    try:
+        if not os.path.exists(CROSSWALK_CSV):
+            logging.warning(f"⚠️ {CROSSWALK_CSV} not found. Crosswalk features disabled.")
+            return None
+
+        ids, documents, metadatas = _read_crosswalk_csv()
+        crosswalk_collection = get_engine().crosswalk
+        existing_ids = set(crosswalk_collection.get(include=[])['ids'])
+
+        wanted_ids = set(ids)
+        stale_ids = [i for i in existing_ids if i not in wanted_ids]
+        if stale_ids:
+            crosswalk_collection.delete(ids=stale_ids)
+
+        new_rows = [n for n, i in enumerate(ids) if i not in existing_ids]
+        if new_rows:
+            new_documents = [documents[n] for n in new_rows]
+            crosswalk_collection.add(
+                ids=[ids[n] for n in new_rows],
+                documents=new_documents,
+                metadatas=[metadatas[n] for n in new_rows],
+                embeddings=_get_embed_model()(new_documents)
+            )
+
+        # Keep the sidecar in step so a full rebuild reuses these embeddings
+        stamp = _crosswalk_stamp(ids, _get_embed_model())
+        if _load_crosswalk_embeddings(ids, stamp) is None:
+            stored = crosswalk_collection.get(ids=ids, include=['embeddings'])
+            by_id = dict(zip(stored['ids'], stored['embeddings']))
+            _save_crosswalk_embeddings(ids, [by_id[i] for i in ids], stamp)
+
+        if new_rows or stale_ids:
+            _MAPPING_CACHE.clear()
+
+        logging.info(f"✅ Crosswalk synced: {len(new_rows)} added, {len(stale_ids)} removed")
+        return len(new_rows), len(stale_ids)
+
+    except Exception as e:
+        logging.error(f"❌ Error syncing crosswalk DB: {e}")
+        return None
+
 def get_framework_mappings(finding_text, threshold=1.4):
     """
     Returns verified framework control IDs from the database.
@@ -87,75 +405,167 @@ def get_framework_mappings(finding_text, threshold=1.4):
     Returns:
         Dictionary with control IDs or None if no match
     """
+    return get_framework_mappings_batch([finding_text], threshold)[0]
+
+def get_framework_mappings_batch(findings, threshold=1.4):
+    """
+    Batched version of get_framework_mappings.
+    Findings looked up before are answered from memory; the rest are
+    embedded and searched in a single query() call.
+
+    Args:
+        findings: List of audit findings to analyze
+        threshold: Maximum distance to accept a match (see get_framework_mappings)
+
+    Returns:
+        List with a control-ID dictionary or None for each finding
+    """
     try:
+        return _query_mappings(findings, threshold)
+    except Exception as e:
+        logging.error(f"❌ Error querying crosswalk DB: {e}")
+        return [None] * len(findings)
+
+def _query_mappings(findings, threshold):
+    """get_framework_mappings_batch without the error handling (raises on failure)."""
+    if not findings:
+        return []
+
+    cached = _MAPPING_CACHE.get_many([(f, threshold) for f in findings])
+    misses = list(dict.fromkeys(f for f in findings if (f, threshold) not in cached))
+
+    if misses:
+        crosswalk_collection = get_engine().crosswalk
         if crosswalk_collection.count() == 0:
-            return None
+            return [None] * len(findings)
 
         results = crosswalk_collection.query(
-            query_texts=[finding_text],
+            query_embeddings=_embed_queries(misses),
             n_results=1
         )
 
-        if results['metadatas'] and len(results['metadatas'][0]) > 0:
+        mappings = {}
+        for finding, metadatas, distances in zip(misses, results['metadatas'], results['distances']):
+            if not metadatas:
+                mappings[(finding, threshold)] = None
+                continue
+
             # Get the distance (lower is better)
-            distance = results['distances'][0][0]
+            distance = distances[0]
 
             logging.info(f"Crosswalk Match Distance: {distance}")
 
             if distance < threshold:
-                mappings = results['metadatas'][0][0]
-                logging.info(f"✅ Crosswalk match found: {mappings.get('pattern_name')}")
-                return mappings
+                logging.info(f"✅ Crosswalk match found: {metadatas[0].get('pattern_name')}")
+                mappings[(finding, threshold)] = metadatas[0]
             else:
                 logging.info(f"⚠️ Match found but distance too high ({distance} >= {threshold})")
-                return None
+                mappings[(finding, threshold)] = None
 
-        return None
+        _MAPPING_CACHE.put_many(mappings)
+        cached.update(mappings)
 
-    except Exception as e:
-        logging.error(f"❌ Error querying crosswalk DB: {e}")
-        return None
+    # Copies, so callers cannot alter the cached metadata
+    return [
+        dict(cached[(f, threshold)]) if cached[(f, threshold)] else None
+        for f in findings
+    ]
+
+def _batched(items, size):
+    """Yield successive `size`-length slices of a list."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _chunk_text(text, target=CHUNK_TARGET_WORDS, overlap=CHUNK_OVERLAP_WORDS):
+    """
+    Split text into chunks of roughly `target` words.
+
+    Paragraphs are accumulated until the next one would overflow the target;
+    a single oversized paragraph is cut into word windows. Each chunk starts
+    with the last `overlap` words of the previous one so sentences spanning
+    a boundary stay retrievable.
+    """
+    chunks = []
+    words = []
+    fresh = 0  # Words not yet emitted in any chunk
+
+    for paragraph in text.split('\n\n'):
+        para_words = paragraph.split()
+        if not para_words:
+            continue
+
+        if fresh and len(words) + len(para_words) > target:
+            chunks.append(" ".join(words))
+            words = words[-overlap:] if overlap else []
+            fresh = 0
+
+        words.extend(para_words)
+        fresh += len(para_words)
+
+        while len(words) > target:
+            chunks.append(" ".join(words[:target]))
+            words = words[target - overlap:]
+            fresh = max(0, len(words) - overlap)
 
-def ingest_policy(pdf_path):
+    if fresh:
+        chunks.append(" ".join(words))
+
+    return chunks
+
+def ingest_policy(pdf_path, source=None):
     """
     Extract text from PDF and store in vector database.
+
+    Chunks are stored under content-hash IDs and tagged with their source
+    file. Chunks of the previous policy that are not part of this one are
+    deleted and only unseen chunks are embedded, so re-uploading the same
+    (or an edited) policy does not rebuild the collection.
     """
     try:
         from pypdf import PdfReader
         
+        source = source or os.path.basename(pdf_path)
+
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
+        # Join once instead of repeated += (quadratic on large PDFs)
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
         
-        # Split into chunks (simple version)
-        # Using double newline as paragraph separator
-        chunks = text.split('\n\n')
-
-        # Clear existing policy to avoid mixing documents (for this simple demo)
-        # In a real app, we might want to keep them or use metadata to separate
-        global policy_collection
-        if policy_collection.count() > 0:
-             # Chroma doesn't have a clear() method on collection, so we delete and recreate or just delete items
-             # Simpler to just delete the collection and recreate in this context
-             chroma_client.delete_collection("company_policies")
-             policy_collection = chroma_client.get_or_create_collection(name="company_policies", embedding_function=default_ef)
-
-        # Add to collection
-        ids = []
-        docs = []
-        for i, chunk in enumerate(chunks):
+        # Split into ~CHUNK_TARGET_WORDS chunks on paragraph boundaries
+        chunks = _chunk_text(text)
+
+        # Content-addressed chunks (the dict also drops duplicate chunks)
+        chunk_by_id = {}
+        for chunk in chunks:
             if len(chunk.strip()) > 50:  # Skip tiny chunks
-                ids.append(f"policy_{i}")
-                docs.append(chunk)
-        
-        if docs:
-            policy_collection.add(
-                ids=ids,
-                documents=docs
+                chunk_by_id.setdefault(hashlib.sha1(chunk.encode('utf-8')).hexdigest(), chunk)
+
+        policy_collection = get_engine().policy
+        existing_ids = set(policy_collection.get(include=[])['ids'])
+
+        # Clear the previous policy to avoid mixing documents
+        stale_ids = [i for i in existing_ids if i not in chunk_by_id]
+        if stale_ids:
+            policy_collection.delete(ids=stale_ids)
+
+        # Chunks already embedded only need their source tag refreshed
+        kept_ids = [i for i in chunk_by_id if i in existing_ids]
+        if kept_ids:
+            policy_collection.update(
+                ids=kept_ids,
+                metadatas=[{'source': source, 'hash': i} for i in kept_ids]
+            )
+
+        # Add in fixed-size batches so each embedding pass covers many chunks
+        new_ids = [i for i in chunk_by_id if i not in existing_ids]
+        for batch_ids in _batched(new_ids, EMBED_BATCH_SIZE):
+            policy_collection.upsert(
+                ids=batch_ids,
+                documents=[chunk_by_id[i] for i in batch_ids],
+                metadatas=[{'source': source, 'hash': i} for i in batch_ids]
             )
         
-        return True, f"Ingested {len(docs)} policy sections"
+        _RESET_COLLECTIONS.discard("company_policies")
+        return True, f"Ingested {len(chunk_by_id)} policy sections ({len(new_ids)} new)"
         
     except Exception as e:
         return False, str(e)
@@ -164,19 +574,59 @@ def query_policy(question):
     """
     Retrieve relevant policy sections for a given question.
     """
+    return query_policy_batch([question])[0]
+
+def query_policy_batch(questions):
+    """
+    Retrieve relevant policy sections for several questions in one query() call.
+
+    Returns:
+        List with the joined policy sections or None for each question
+    """
     try:
-        if policy_collection.count() == 0:
-            return None
-            
-        results = policy_collection.query(
-            query_texts=[question],
-            n_results=3
-        )
-        
-        if results['documents']:
-            return "\n\n".join(results['documents'][0])
-        return None
-        
+        return _query_policies(questions)
     except Exception as e:
         logging.error(f"Policy query error: {e}")
-        return None
+        return [None] * len(questions)
+
+def _query_policies(questions):
+    """query_policy_batch without the error handling (raises on failure)."""
+    if not questions:
+        return []
+
+    policy_collection = get_engine().policy
+    if policy_collection.count() == 0:
+        return [None] * len(questions)
+
+    results = policy_collection.query(
+        query_embeddings=_embed_queries(list(questions)),
+        n_results=3
+    )
+
+    if results['documents']:
+        return ["\n\n".join(docs) if docs else None for docs in results['documents']]
+    return [None] * len(questions)
+
+def retrieve_batch(findings, threshold=1.4):
+    """
+    Fetch crosswalk mappings and policy context for the same findings
+    concurrently. The findings are embedded once up front; both vector
+    searches spend their time in native code (HNSW) outside the GIL, so
+    they overlap.
+
+    Unlike the *_batch functions, errors are raised rather than turned into
+    "no match", so callers that cache the result do not cache a failure.
+
+    Returns:
+        Tuple (mappings, contexts), each a list aligned with `findings`
+    """
+    if not findings:
+        return [], []
+
+    # Embed once here; both threads then hit the query embedding cache
+    _embed_queries(list(findings))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        mappings = executor.submit(_query_mappings, findings, threshold)
+        contexts = executor.submit(_query_policies, findings)
+        return mappings.result(), contexts.result()
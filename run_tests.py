@@ -1,16 +1,23 @@
 """
 Test runner for AI Auditor unit tests
 """
+import importlib.util
 import pytest
 import sys
 
 if __name__ == "__main__":
-    # Run all tests with verbose output
-    exit_code = pytest.main([
+    args = [
         "tests/",
         "-v",
         "--tb=short",
         "--color=yes"
-    ])
+    ]
+
+    # Spread tests over all cores; the DB tests stay together on one worker
+    if importlib.util.find_spec("xdist"):
+        args += ["-n", "auto", "--dist=loadgroup"]
+
+    # Run all tests with verbose output
+    exit_code = pytest.main(args)
 
     sys.exit(exit_code)
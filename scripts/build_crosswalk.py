@@ -0,0 +1,30 @@
+"""
+Script to pre-build the crosswalk vector database from CSV
+
+Embeds framework_crosswalk.csv into ./chroma_db once, so app startup only
+loads the persisted collection instead of embedding every pattern.
+
+Usage (from the project root):
+    python scripts/build_crosswalk.py            # build if empty
+    python scripts/build_crosswalk.py --rebuild  # re-embed from CSV
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rag_engine
+
+parser = argparse.ArgumentParser(description="Build the crosswalk vector database")
+parser.add_argument("--rebuild", action="store_true", help="drop the stored crosswalk and re-embed it from CSV")
+args = parser.parse_args()
+
+print("Building crosswalk database from CSV..." if args.rebuild else "Loading crosswalk database...")
+success = rag_engine.load_crosswalk_db(rebuild=args.rebuild)
+
+if success:
+    count = rag_engine.crosswalk_collection.count()
+    print(f"Crosswalk ready: {count} patterns in {rag_engine.CHROMA_PATH}")
+else:
+    print("Failed to build crosswalk database")
+    sys.exit(1)
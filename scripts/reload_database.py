@@ -1,12 +1,22 @@
 """
-Script to force reload the crosswalk database from CSV
+Script to reload the crosswalk database from CSV
+
+By default only patterns whose CSV row changed are re-embedded (rows are
+keyed by a SHA-256 of their contents). Use --force to delete the entire
+ChromaDB directory and re-embed everything.
 """
-import chromadb
-import shutil
+import sys
 import os
+import shutil
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+parser = argparse.ArgumentParser(description="Reload the crosswalk database from CSV")
+parser.add_argument("--force", action="store_true", help="delete ./chroma_db and re-embed every pattern")
+args = parser.parse_args()
 
 # Delete the entire ChromaDB directory
-if os.path.exists('./chroma_db'):
+if args.force and os.path.exists('./chroma_db'):
     print("Deleting old ChromaDB data...")
     shutil.rmtree('./chroma_db')
     print("Old database deleted")
@@ -14,8 +24,15 @@ if os.path.exists('./chroma_db'):
 # Now import and load fresh
 import rag_engine
 
-print("\nLoading crosswalk database from CSV...")
-success = rag_engine.load_crosswalk_db()
+if args.force:
+    print("\nLoading crosswalk database from CSV...")
+    success = rag_engine.load_crosswalk_db(rebuild=True)
+else:
+    print("\nSyncing crosswalk database with CSV...")
+    delta = rag_engine.sync_crosswalk_db()
+    success = delta is not None
+    if success:
+        print(f"Re-embedded {delta[0]} changed patterns, removed {delta[1]} stale patterns")
 
 if success:
     count = rag_engine.crosswalk_collection.count()
@@ -0,0 +1,20 @@
+"""
+Shared pytest fixtures
+"""
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)  # Before xdist reads the group markers
+def pytest_collection_modifyitems(config, items):
+    """Put all db_serial tests in one xdist group (used by --dist=loadgroup)"""
+    for item in items:
+        if item.get_closest_marker("db_serial"):
+            item.add_marker(pytest.mark.xdist_group("db"))
+
+
+@pytest.fixture(scope="session")
+def crosswalk_db():
+    """Load the crosswalk database once and share it across all tests"""
+    import rag_engine
+    rag_engine.load_crosswalk_db()
+    yield rag_engine.crosswalk_collection
@@ -1,12 +1,22 @@
 """
 Unit tests for JSON extraction from LLM output
 """
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import textwrap
 
-import pytest
-from app import extract_json
+from audit_utils import extract_json, find_json_span, parse_risks
+
+_MARKDOWN_SAMPLE = textwrap.dedent("""\
+    ```json
+    {"finding": "weak password", "severity": "high"}
+    ```""")
+
+_NEWLINE_SAMPLE = textwrap.dedent("""
+    {
+        "risk": "shared credentials",
+        "iso_27001": "A.9.2.4",
+        "recommendation": "Implement unique accounts"
+    }
+    """)
 
 
 def test_extract_simple_json():
@@ -41,10 +51,7 @@ def test_extract_nested_json():
 
 def test_extract_json_with_markdown():
     """Test extraction from markdown code blocks"""
-    text = '''```json
-    {"finding": "weak password", "severity": "high"}
-    ```'''
-    result = extract_json(text)
+    result = extract_json(_MARKDOWN_SAMPLE)
     assert result == {"finding": "weak password", "severity": "high"}
 
 
@@ -70,6 +77,26 @@ def test_extract_array_json():
     assert len(result) == 2
 
 
+def test_extract_array_json_with_preamble():
+    """Test extraction of a JSON array surrounded by prose"""
+    text = 'Here are the risks: [{"id": 1}, {"id": 2}] Hope this helps.'
+    result = extract_json(text)
+    assert result == [{"id": 1}, {"id": 2}]
+
+
+def test_extract_json_after_non_json_brackets():
+    """Test that a leading non-JSON [...] falls back to the object block"""
+    text = 'See [ISO 27001] mapping: {"risk": "test"}'
+    result = extract_json(text)
+    assert result == {"risk": "test"}
+
+
+def test_extract_json_after_valid_json_brackets():
+    """Test that a leading reference like [1] does not win over the object"""
+    assert extract_json('Finding [1]: {"risks": []}') == {"risks": []}
+    assert extract_json('Sources [2024, "ISO"] {"risk": "test"}') == {"risk": "test"}
+
+
 def test_extract_json_with_special_chars():
     """Test extraction of JSON with special characters"""
     text = '{"description": "Password contains @, #, $, %, &"}'
@@ -80,17 +107,43 @@ def test_extract_json_with_special_chars():
 
 def test_extract_json_with_newlines():
     """Test extraction of multiline JSON"""
-    text = '''
-    {
-        "risk": "shared credentials",
-        "iso_27001": "A.9.2.4",
-        "recommendation": "Implement unique accounts"
-    }
-    '''
-    result = extract_json(text)
+    result = extract_json(_NEWLINE_SAMPLE)
     assert result["risk"] == "shared credentials"
     assert result["iso_27001"] == "A.9.2.4"
 
 
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+def test_extract_json_with_braces_in_strings():
+    """Test that braces and escaped quotes inside strings don't end the block"""
+    text = 'Result: {"description": "uses {curly} \\"quoted\\" text", "id": 1} done'
+    result = extract_json(text)
+    assert result == {"description": 'uses {curly} "quoted" text', "id": 1}
+
+
+def test_find_json_span_unbalanced():
+    """Test that an unbalanced block yields no span"""
+    assert find_json_span('{"a": {"b": 1}') is None
+    assert find_json_span("no braces here") is None
+
+
+def test_find_json_span_pathological_input():
+    """Test that deeply nested unclosed braces are scanned in linear time"""
+    text = "{" * 100000
+    assert find_json_span(text) is None
+
+
+def test_parse_risks_valid():
+    """Test that a risks object yields its list and no error"""
+    assert parse_risks('{"risks": [{"description": "x"}]}') == ([{"description": "x"}], None)
+
+
+def test_parse_risks_empty_list_is_not_an_error():
+    """Test that 'no risks' is a valid result, not a parse failure"""
+    assert parse_risks('{"risks": []}') == ([], None)
+    assert parse_risks('[]') == ([], None)
+
+
+def test_parse_risks_distinguishes_errors():
+    """Test that unparseable output and a wrong structure are reported apart"""
+    assert parse_risks("no json here") == (None, "invalid_json")
+    assert parse_risks('{"risks": "none"}') == (None, "invalid_structure")
+    assert parse_risks('{"risks": [1, 2]}') == (None, "invalid_structure")
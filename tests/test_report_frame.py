@@ -0,0 +1,41 @@
+"""
+Unit tests for flattening risks into the export table
+"""
+import io
+
+import pandas as pd
+import pytest
+from audit_utils import risks_to_frame
+
+
+def test_risks_to_frame_flattens_mappings():
+    """Test that each framework gets its own string column"""
+    risks = [{"description": "No MFA", "recommendation": "Enable MFA",
+              "mappings": {"iso_27001": "A.9.4.2", "soc_2": "CC6.1"}}]
+    df = risks_to_frame(risks)
+    assert df.loc[0, "mappings.iso_27001"] == "A.9.4.2"
+    assert df.loc[0, "mappings.soc_2"] == "CC6.1"
+
+
+def test_risks_to_frame_mixed_value_types():
+    """Test that list and missing mapping values become text"""
+    risks = [
+        {"description": "a", "mappings": {"iso_27001": ["A.9.4.1", "A.9.2.4"]}},
+        {"description": "b", "mappings": {"iso_27001": "A.9.4.2", "hipaa": "164.312(d)"}},
+    ]
+    df = risks_to_frame(risks)
+    assert df["mappings.iso_27001"].tolist() == ["A.9.4.1, A.9.2.4", "A.9.4.2"]
+    assert df["mappings.hipaa"].tolist() == ["", "164.312(d)"]
+
+
+def test_risks_to_frame_writes_parquet():
+    """Test that awkward model output still serializes to Parquet"""
+    pytest.importorskip("pyarrow")
+    risks = [
+        {"description": "a", "mappings": {}},
+        {"description": "b", "mappings": {"iso_27001": ["A.9.4.1"]}, "severity": 3},
+    ]
+    buf = io.BytesIO()
+    risks_to_frame(risks).to_parquet(buf, index=False)
+    buf.seek(0)
+    assert pd.read_parquet(buf)["description"].tolist() == ["a", "b"]
@@ -1,12 +1,7 @@
 """
 Unit tests for input sanitization functions
 """
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-import pytest
-from app import sanitize_input, MAX_INPUT_LENGTH
+from audit_utils import sanitize_input, MAX_INPUT_LENGTH
 
 
 def test_sanitize_normal_text():
@@ -81,7 +76,3 @@ def test_sanitize_special_characters():
     assert "@" in result
     assert "!" in result
     assert "." in result
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Unit tests for splitting audit notes into individual findings
+"""
+from audit_utils import split_findings, MAX_FINDINGS
+
+
+def test_split_single_paragraph():
+    """Test that plain prose stays a single finding"""
+    text = "VPN access requires only username and password. Multi-factor authentication is not enabled."
+    assert split_findings(text) == [text]
+
+
+def test_split_bullets():
+    """Test that each bullet becomes its own finding"""
+    text = "- Users share the admin password via Slack\n- Database backups untested for 14 months"
+    assert split_findings(text) == [
+        "Users share the admin password via Slack",
+        "Database backups untested for 14 months",
+    ]
+
+
+def test_split_numbered_list():
+    """Test that numbered items become separate findings"""
+    text = "1. Users share the admin password via Slack\n2) Database backups untested for 14 months"
+    assert len(split_findings(text)) == 2
+
+
+def test_split_paragraphs():
+    """Test that blank lines separate findings"""
+    text = "Server room door code unchanged for 2 years.\n\nNo vendor security assessment was performed."
+    assert len(split_findings(text)) == 2
+
+
+def test_split_joins_continuation_lines():
+    """Test that wrapped bullet lines stay with their bullet"""
+    text = "- Backups run nightly but are untested\n  and stored on the production network\n- No MFA on VPN access for contractors"
+    result = split_findings(text)
+    assert result[0] == "Backups run nightly but are untested and stored on the production network"
+
+
+def test_split_drops_headings():
+    """Test that heading lines are not treated as findings"""
+    text = "Findings:\n- Users share the admin password via Slack\n- Database backups untested for 14 months"
+    assert split_findings(text) == [
+        "Users share the admin password via Slack",
+        "Database backups untested for 14 months",
+    ]
+
+
+def test_split_keeps_short_bullets():
+    """Test that short bullets are analyzed, not dropped"""
+    text = "- No MFA on VPN\n- Database backups untested for 14 months"
+    assert split_findings(text) == [
+        "No MFA on VPN",
+        "Database backups untested for 14 months",
+    ]
+
+
+def test_split_keeps_short_paragraphs():
+    """Test that short paragraphs are analyzed, not dropped"""
+    text = "Weak passwords.\nNo MFA.\n\nBackups untested."
+    assert split_findings(text) == ["Weak passwords. No MFA.", "Backups untested."]
+
+
+def test_split_keeps_bullet_ending_in_colon():
+    """Test that a bullet ending in ':' is a finding, not a heading"""
+    text = "- Shared admin accounts on:\n- Database backups untested for 14 months"
+    assert split_findings(text)[0] == "Shared admin accounts on:"
+
+
+def test_split_too_many_findings():
+    """Test that heavily fragmented input is analyzed as one finding"""
+    text = "\n".join(f"- Finding number {i} about missing controls" for i in range(MAX_FINDINGS + 1))
+    assert split_findings(text) == [text]
@@ -0,0 +1,38 @@
+"""
+Unit tests for enforcing database control IDs on model output
+"""
+from audit_utils import apply_verified_mappings
+
+
+DB_MAPPINGS = {
+    'pattern_name': 'no_mfa',
+    'iso_27001': 'A.9.4.2',
+    'soc_2': 'CC6.1',
+    'hipaa': '164.312(d)',
+    'nist_csf': 'PR.AC-7',
+}
+
+
+def test_verified_mappings_overwrite_model_ids():
+    """Test that copied example IDs are replaced with the database values"""
+    risks = [{"description": "No MFA", "mappings": {"iso_27001": "A.9.4.1", "soc_2": "CC6.1"}}]
+    result = apply_verified_mappings(risks, DB_MAPPINGS)
+    assert result[0]["mappings"] == {
+        "iso_27001": "A.9.4.2",
+        "soc_2": "CC6.1",
+        "hipaa": "164.312(d)",
+        "nist_csf": "PR.AC-7",
+    }
+
+
+def test_verified_mappings_fill_missing_mappings():
+    """Test that risks without a mappings field get the database values"""
+    result = apply_verified_mappings([{"description": "No MFA"}], DB_MAPPINGS)
+    assert result[0]["mappings"]["iso_27001"] == "A.9.4.2"
+
+
+def test_verified_mappings_no_match_keeps_model_output():
+    """Test that model mappings are kept when the database had no match"""
+    risks = [{"description": "Odd finding", "mappings": {"iso_27001": "A.5.1"}}]
+    assert apply_verified_mappings(risks, None) == risks
+    assert risks[0]["mappings"] == {"iso_27001": "A.5.1"}